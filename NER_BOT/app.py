@@ -1,13 +1,21 @@
 import streamlit as st
-from langchain_groq import ChatGroq
-from langchain.prompts import PromptTemplate
-from langchain.schema import HumanMessage
 import os
-from dotenv import load_dotenv
 import time
+from extractor_core import (
+    MAX_INPUT_CHARS,
+    MAX_INPUT_TOKENS,
+    MODELS,
+    NER_TASK,
+    approx_tokens,
+    load_env,
+    make_llm,
+    record_failure,
+    render_downloads,
+    run_extraction,
+)
 
-# Load environment variables
-load_dotenv()
+# Load environment variables once per process
+load_env()
 
 # Initialize Streamlit config with improved metadata
 st.set_page_config(
@@ -17,30 +25,6 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Improved prompt template with clearer instructions and examples
-PROMPT_TEMPLATE = """You are an expert in entity extraction and natural language processing. 
-Extract named entities from the given text, focusing on people, organizations, locations, and associated geographic information.
-
-Input text: {text}
-
-Provide a structured analysis in the following markdown table format:
-| Name | Entity_Type | address |City | Country | Country_Code |
-
-Guidelines:
-- Name: The extracted entity name
-- Entity_Type: One of [PERSON, ORGANIZATION, LOCATION]
-- City: Associated city (if applicable)
-- Country: Full country name (if applicable)
-- Country_Code: ISO 2-letter country code (if applicable)
-
-Example:
-For text: "Tim Cook from Apple in Cupertino, USA announced..."
-| Tim Cook | PERSON | Cupertino | United States | US |
-| Apple | ORGANIZATION | Cupertino | United States | US |
-
-Only include relevant named entities. Leave fields blank with '-' if not applicable.
-Ensure all country codes are valid ISO 2-letter codes."""
-
 class EntityExtractor:
     def __init__(self):
         self.api_key = os.getenv("GROQ_API_KEY")
@@ -54,74 +38,67 @@ class EntityExtractor:
         Enter your text below to analyze people, organizations, and locations.
         """)
         
-    def initialize_llm(self):
+    def initialize_llm(self, model_name):
         """Initialize the ChatGroq LLM with error handling"""
         try:
-            return ChatGroq(
-                api_key=self.api_key,
-                model="llama-3.2-3b-preview",
-                temperature=0,
-                max_tokens=1000,
-                timeout=15,
-                max_retries=3
-            )
+            return make_llm(self.api_key, model_name)
         except Exception as e:
             st.error(f"Failed to initialize LLM: {str(e)}")
             return None
             
-    def process_text(self, input_text):
+    def process_text(self, input_text, model_name):
         """Process the input text and extract entities"""
         if not self.api_key:
             st.error("⚠️ GROQ_API_KEY not found. Please check your environment variables.")
             return
             
-        llm = self.initialize_llm()
+        if approx_tokens(input_text) > MAX_INPUT_TOKENS:
+            st.error(f"⚠️ Text is too long. Please limit input to {MAX_INPUT_CHARS:,} characters.")
+            return
+            
+        llm = self.initialize_llm(model_name)
         if not llm:
             return
             
         try:
-            # Create prompt
-            prompt = PromptTemplate(
-                input_variables=['text'],
-                template=PROMPT_TEMPLATE
-            )
-            formatted_prompt = prompt.format(text=input_text)
-            
-            # Process with LLM
+            # Process with LLM (identical inputs are served from cache)
             with st.spinner("🔄 Analyzing text..."):
                 start_time = time.time()
-                messages = [HumanMessage(content=formatted_prompt)]
-                response = llm.invoke(messages)
-                processing_time = time.time() - start_time
-                
-                # Extract and display results
-                result = response.content if hasattr(response, 'content') else str(response)
-                
-                # Display results in a nice format
                 st.subheader("📊 Extracted Entities")
-                st.markdown(result)
-                st.info(f"⚡ Processing completed in {processing_time:.2f} seconds")
+                # Long inputs are split so each paragraph or chunk is analyzed concurrently
+                extraction = run_extraction(NER_TASK, llm, model_name, input_text, st.empty(), split=True)
+                if extraction is None:
+                    return
+                processing_time = time.time() - start_time
                 
-                # Add download functionality
-                st.download_button(
-                    label="📥 Download Results",
-                    data=result,
-                    file_name="extracted_entities.md",
-                    mime="text/markdown"
-                )
+            _render_results(*extraction, processing_time)
                 
         except Exception as e:
+            record_failure(e)
             st.error(f"❌ Error during processing: {str(e)}")
             st.info("Please try again or check your input text.")
 
-def main():
-    extractor = EntityExtractor()
+@st.fragment
+def _render_results(result, rows, processing_time):
+    """Timing and download controls, rerun on their own so downloading keeps the page intact"""
+    st.info(f"⚡ Processing completed in {processing_time:.2f} seconds")
     
+    # Add download functionality
+    render_downloads(result, rows, "extracted_entities", icon="📥 ")
+
+def _clear_input():
+    """Reset the text area before the next run"""
+    st.session_state.input_area = ""
+
+@st.fragment
+def _analyze_section(extractor, model_name):
+    """Input and analysis, scoped so their interactions rerun only this section"""
     # Input area with improved UX
     input_text = st.text_area(
         "Enter text to analyze:",
         placeholder="Example: Tim Cook from Apple in Cupertino, USA announced...",
         height=150,
+        max_chars=MAX_INPUT_CHARS,
         key="input_area"
     )
     
@@ -130,16 +107,24 @@ def main():
     with col1:
         analyze_button = st.button("🔍 Analyze", type="primary")
     with col2:
-        clear_button = st.button("🗑️ Clear")
-    
-    if clear_button:
-        st.session_state.input_area = ""
-        st.experimental_rerun()
+        st.button("🗑️ Clear", on_click=_clear_input)
         
     if analyze_button and input_text.strip():
-        extractor.process_text(input_text)
+        extractor.process_text(input_text, model_name)
     elif analyze_button:
         st.warning("⚠️ Please enter some text to analyze.")
 
+def main():
+    extractor = EntityExtractor()
+    
+    # Model selection in the sidebar
+    model_name = st.sidebar.selectbox(
+        "Model",
+        MODELS,
+        help="llama-3.1-8b-instant is fastest; mixtral-8x7b-32768 gives higher quality results."
+    )
+    
+    _analyze_section(extractor, model_name)
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
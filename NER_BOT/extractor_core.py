@@ -0,0 +1,473 @@
+import streamlit as st
+import functools
+import asyncio
+import hashlib
+import threading
+import time
+import xxhash
+from dotenv import load_dotenv
+from markdown_table import parse_markdown_table
+
+# Fast default model for extraction; mixtral stays available as a higher quality option
+MODELS = ["llama-3.1-8b-instant", "mixtral-8x7b-32768"]
+
+# Client settings shared by every page, so each model gets exactly one client
+# and one connection pool; tasks bind smaller per-call output budgets
+CLIENT_MAX_TOKENS = 500
+CLIENT_TIMEOUT = 15
+
+# Input limits: ~4 characters per token. Longer paragraphs are split into
+# chunks that are analyzed concurrently instead of one slow, oversized prefill.
+# Chunks are sized so their entities (~10 table rows) fit a 400-token output budget
+MAX_INPUT_TOKENS = 6000
+MAX_INPUT_CHARS = MAX_INPUT_TOKENS * 4
+MAX_CHUNK_CHARS = 1500
+
+# Appended to a result whose table was cut off at the output token budget
+CUT_OFF_NOTE = "_The table was cut off at the output limit; its last, incomplete row was dropped._"
+
+# Every uploaded text is a separate paid call, so cap how many one file may hold
+MAX_UPLOAD_TEXTS = 200
+
+# Requests in flight at once for one analysis, well under the client's connection pool
+MAX_CONCURRENCY = 8
+
+# Per-call decode budget derived from the number of rows the text may yield
+BASE_OUTPUT_TOKENS = 128
+TOKENS_PER_ROW = 40
+
+# The semantic cache embeds with all-MiniLM-L6-v2, which truncates at 512
+# tokens; longer texts would match on their opening alone, so they only use
+# the exact-match cache
+SEMANTIC_MAX_CHARS = 1000
+
+# Stop calling the API for a while after repeated consecutive failures
+BREAKER_THRESHOLD = 3
+BREAKER_WINDOW = 30
+
+# Static instructions sent as the system message; the user's text follows in a
+# separate message so every request shares the same cacheable prompt prefix
+NER_SYSTEM_PROMPT = """You are an expert in entity extraction and natural language processing.
+Extract named entities from the text provided by the user, focusing on people, organizations, locations, and associated geographic information.
+
+Provide a structured analysis in the following markdown table format:
+| Name | Entity_Type | City | Country | Country_Code |
+
+Guidelines:
+- Name: The extracted entity name
+- Entity_Type: One of [PERSON, ORGANIZATION, LOCATION]
+- City: Associated city (if applicable)
+- Country: Full country name (if applicable)
+- Country_Code: ISO 2-letter country code (if applicable)
+
+Example:
+For text: "Tim Cook from Apple in Cupertino, USA announced..."
+| Tim Cook | PERSON | Cupertino | United States | US |
+| Apple | ORGANIZATION | Cupertino | United States | US |
+
+Only include relevant named entities. Leave fields blank with '-' if not applicable.
+Ensure all country codes are valid ISO 2-letter codes."""
+
+MEDICAL_SYSTEM_PROMPT = """You are a medical expert and good at English. Extract all the medical entities from the tweet given by the user and assign the appropriate medical entity labels.
+
+Please format your response as a markdown table with the following columns:
+| Entity | Label | Context |
+
+Only include medical terms, conditions, symptoms, medications, or healthcare-related entities.
+"""
+
+@st.cache_resource(show_spinner=False)
+def load_env():
+    """Load environment variables once per process"""
+    load_dotenv()
+
+@functools.lru_cache(maxsize=None)
+def _lazy_imports():
+    """Import langchain on first use so cold starts stay light until text is analyzed"""
+    from langchain_groq import ChatGroq
+    from langchain_core.prompts import ChatPromptTemplate
+    return ChatGroq, ChatPromptTemplate
+
+class ExtractionTask:
+    """System prompt, table layout and output budget for one kind of extraction"""
+
+    def __init__(self, system_prompt, columns, max_output_tokens):
+        self.system_prompt = system_prompt
+        self.columns = columns
+        self.max_output_tokens = max_output_tokens
+        # Fingerprint of the system prompt so cached results are dropped when it changes
+        self.template_hash = hashlib.blake2b(system_prompt.encode(), digest_size=8).hexdigest()
+
+    @functools.cached_property
+    def chat_prompt(self):
+        """Static system instructions followed by the user's text, parsed once"""
+        _, ChatPromptTemplate = _lazy_imports()
+        return ChatPromptTemplate.from_messages([
+            ("system", self.system_prompt),
+            ("human", "{text}")
+        ])
+
+    def max_tokens_for(self, text):
+        """Output token budget scaled to the rough number of table rows expected for text"""
+        expected_rows = max(5, text.count("\n") + text.count("."))
+        return min(self.max_output_tokens, BASE_OUTPUT_TOKENS + TOKENS_PER_ROW * expected_rows)
+
+    def chain(self, llm, text):
+        """Prompt piped into the client with an output budget sized for text"""
+        return self.chat_prompt | llm.bind(max_tokens=self.max_tokens_for(text))
+
+NER_TASK = ExtractionTask(
+    NER_SYSTEM_PROMPT,
+    ["Name", "Entity_Type", "City", "Country", "Country_Code"],
+    max_output_tokens=400
+)
+
+MEDICAL_TASK = ExtractionTask(
+    MEDICAL_SYSTEM_PROMPT,
+    ["Entity", "Label", "Context"],
+    max_output_tokens=500
+)
+
+@st.cache_resource(show_spinner=False)
+def make_llm(api_key, model):
+    """Build the ChatGroq client once per model and share it across pages and reruns"""
+    import httpx
+    ChatGroq, _ = _lazy_imports()
+
+    # Keep-alive HTTP/2 pools live as long as the client, so repeated calls
+    # reuse the same TCP+TLS session
+    limits = httpx.Limits(
+        max_keepalive_connections=20,
+        max_connections=40,
+        keepalive_expiry=300
+    )
+    # Retries are handled by retry_policy(), so the client's own fixed backoff is off
+    return ChatGroq(
+        api_key=api_key,
+        model=model,
+        temperature=0,
+        max_tokens=CLIENT_MAX_TOKENS,
+        timeout=CLIENT_TIMEOUT,
+        max_retries=0,
+        http_client=httpx.Client(http2=True, limits=limits),
+        http_async_client=httpx.AsyncClient(http2=True, limits=limits)
+    )
+
+@functools.lru_cache(maxsize=None)
+def _retryable_errors():
+    """Transient Groq errors worth retrying: rate limits, 5xx and network failures"""
+    import groq
+    return (groq.RateLimitError, groq.APIConnectionError, groq.InternalServerError)
+
+@functools.lru_cache(maxsize=None)
+def retry_policy():
+    """Jittered exponential backoff for transient Groq errors"""
+    from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_random_exponential
+    return retry(
+        wait=wait_random_exponential(min=0.2, max=4),
+        stop=stop_after_attempt(4),
+        retry=retry_if_exception_type(_retryable_errors()),
+        reraise=True
+    )
+
+def _open_stream(chain, inputs):
+    """Start streaming and wait for the first chunk so request errors surface here"""
+    stream = iter(chain.stream(inputs))
+    return stream, next(stream, None)
+
+def stream_extraction(task, llm, input_text):
+    """Yield the extraction result chunk by chunk as the model generates it"""
+    chain = task.chain(llm, input_text)
+    # Retry only until the first chunk arrives; once tokens are on screen a failure is final
+    stream, first = retry_policy()(_open_stream)(chain, {"text": input_text})
+    last = first
+    if first is not None:
+        yield first.content
+    for chunk in stream:
+        last = chunk
+        yield chunk.content
+    if last is not None and _is_cut_off(last):
+        yield "\n\n" + CUT_OFF_NOTE
+
+def _is_cut_off(message):
+    """True when the model stopped because it ran out of output tokens"""
+    return message.response_metadata.get("finish_reason") == "length"
+
+def _close_cut_off(content):
+    """Drop the row the model was writing when it hit its output budget and flag the result"""
+    lines = content.rstrip().splitlines()
+    if lines and lines[-1].strip().startswith("|") and not lines[-1].strip().endswith("|"):
+        lines.pop()
+    return "\n".join(lines + ["", CUT_OFF_NOTE])
+
+def _response_text(response):
+    """Text of a complete response, with a cut-off table closed by _close_cut_off()"""
+    if _is_cut_off(response):
+        return _close_cut_off(response.content)
+    return response.content
+
+@st.cache_resource(show_spinner=False)
+def _event_loop():
+    """Background event loop shared by all sessions for concurrent LLM calls"""
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, daemon=True).start()
+    return loop
+
+async def _run_many(task, llm, texts):
+    """Extract entities from several texts, at most MAX_CONCURRENCY at a time"""
+    limit = asyncio.Semaphore(MAX_CONCURRENCY)
+
+    async def run_one(text):
+        async with limit:
+            return await retry_policy()(task.chain(llm, text).ainvoke)({"text": text})
+
+    runs = [asyncio.ensure_future(run_one(text)) for text in texts]
+    try:
+        responses = await asyncio.gather(*runs)
+    except BaseException:
+        # One failure fails the analysis, so stop the requests still queued or in flight
+        for run in runs:
+            run.cancel()
+        raise
+    return [_response_text(response) for response in responses]
+
+def run_concurrent(task, llm, texts):
+    """Run the extraction for each text concurrently on the shared event loop"""
+    return asyncio.run_coroutine_threadsafe(
+        _run_many(task, llm, texts), _event_loop()
+    ).result()
+
+def run_batch(task, llm, texts):
+    """Run the extraction over many texts with bounded concurrency.
+
+    Transient errors are retried per text, so one rate-limited request does
+    not fail the batch. One chain serves the whole batch, so the output budget
+    is the largest one any of the texts needs.
+    """
+    from langchain_core.runnables import RunnableLambda
+    max_tokens = max(task.max_tokens_for(text) for text in texts)
+    chain = task.chat_prompt | llm.bind(max_tokens=max_tokens)
+    # Same backoff as single requests rather than with_retry()'s 1-10 s defaults
+    responses = RunnableLambda(retry_policy()(chain.invoke)).batch(
+        [{"text": text} for text in texts],
+        config={"max_concurrency": MAX_CONCURRENCY}
+    )
+    return [_response_text(response) for response in responses]
+
+def approx_tokens(text):
+    """Rough token count used to bound request size"""
+    return len(text) // 4
+
+def split_paragraphs(input_text):
+    """Split the input on blank lines into independent texts of bounded size"""
+    pieces = []
+    for part in input_text.split("\n\n"):
+        part = part.strip()
+        # Break oversized paragraphs at the last whitespace before the limit
+        while len(part) > MAX_CHUNK_CHARS:
+            cut = part.rfind(" ", 0, MAX_CHUNK_CHARS)
+            if cut <= 0:
+                cut = MAX_CHUNK_CHARS
+            pieces.append(part[:cut].strip())
+            part = part[cut:].strip()
+        if part:
+            pieces.append(part)
+
+    # Merge consecutive short paragraphs up to the limit, so a paste of many
+    # short lines costs a few requests rather than one per paragraph
+    chunks = []
+    for piece in pieces:
+        if chunks and len(chunks[-1]) + 2 + len(piece) <= MAX_CHUNK_CHARS:
+            chunks[-1] += "\n\n" + piece
+        else:
+            chunks.append(piece)
+    return chunks
+
+def read_uploaded_texts(uploaded_file):
+    """Read one text per line from a .txt upload, or the "text" (else first) column of a .csv.
+
+    Raises ValueError for unreadable files, uploads of more than
+    MAX_UPLOAD_TEXTS texts, and texts over the MAX_INPUT_TOKENS limit that
+    applies to typed input.
+    """
+    if uploaded_file.name.lower().endswith(".csv"):
+        import pandas as pd
+        df = pd.read_csv(uploaded_file)
+        column = "text" if "text" in df.columns else df.columns[0]
+        texts = df[column].dropna().astype(str).tolist()
+    else:
+        texts = uploaded_file.getvalue().decode("utf-8").splitlines()
+    texts = [text.strip() for text in texts if text.strip()]
+    if len(texts) > MAX_UPLOAD_TEXTS:
+        raise ValueError(f"the file holds {len(texts):,} texts; please upload at most {MAX_UPLOAD_TEXTS:,}.")
+    for number, text in enumerate(texts, start=1):
+        if approx_tokens(text) > MAX_INPUT_TOKENS:
+            raise ValueError(f"text {number} is too long; please limit each text to {MAX_INPUT_CHARS:,} characters.")
+    return texts
+
+def breaker_open():
+    """True after BREAKER_THRESHOLD consecutive failures within BREAKER_WINDOW seconds"""
+    now = time.time()
+    failures = [t for t in st.session_state.get('llm_failures', []) if now - t < BREAKER_WINDOW]
+    st.session_state['llm_failures'] = failures
+    return len(failures) >= BREAKER_THRESHOLD
+
+def record_failure(error):
+    """Count a failed analysis towards the circuit breaker.
+
+    Only transient API errors that are still failing after retry_policy()
+    gave up are counted; bad input, auth or programming errors surface
+    without tripping the breaker.
+    """
+    if isinstance(error, _retryable_errors()):
+        st.session_state.setdefault('llm_failures', []).append(time.time())
+
+def record_success():
+    """Close the circuit breaker after a successful call"""
+    st.session_state['llm_failures'] = []
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _cached_response(model_name, template_hash, text_key, _result=None):
+    """Exact-match response cache keyed on model, template and input fingerprint.
+
+    Only short strings are hashed: callers pass the model name, the prompt's
+    fingerprint and text_key() of the input rather than the full text, the
+    client or prompt objects, which would be slow to hash (and the httpx
+    clients are not picklable).
+
+    Streamlit never caches exceptions, so a lookup without ``_result`` raises
+    KeyError on a miss; call again with the streamed ``_result`` to store it.
+    """
+    if _result is None:
+        raise KeyError(text_key)
+    return _result
+
+def text_key(input_text):
+    """Fast 128-bit fingerprint of the input used as its cache key"""
+    return xxhash.xxh3_128_hexdigest(input_text)
+
+@st.cache_resource(show_spinner=False)
+def _semantic_cache():
+    """Process-wide cache that also matches lightly edited versions of earlier inputs.
+
+    Returns None when the embedding model cannot be imported or downloaded, so
+    the failure is cached and later requests skip the cache instead of paying
+    for another attempt.
+    """
+    try:
+        from semantic_cache import SemanticCache
+        return SemanticCache(threshold=0.97, max_entries=1000, ttl=3600)
+    except Exception:
+        return None
+
+def _semantic_lookup(key, input_text):
+    """Semantic cache lookup where a disabled or failing cache is a miss"""
+    cache = _semantic_cache()
+    if cache is None or len(input_text) > SEMANTIC_MAX_CHARS:
+        return None
+    try:
+        return cache.lookup(key, input_text)
+    except Exception:
+        return None
+
+def _semantic_add(key, input_text, result):
+    """Best-effort semantic cache insert; a broken cache never blocks the analysis"""
+    cache = _semantic_cache()
+    if cache is None or len(input_text) > SEMANTIC_MAX_CHARS:
+        return
+    try:
+        cache.add(key, input_text, result)
+    except Exception:
+        pass
+
+def lookup_result(task, model_name, input_text, semantic=True):
+    """Return an earlier result from the session, exact or semantic cache; KeyError on a miss"""
+    last = st.session_state.get(f"last_result_{task.template_hash}")
+    if last is not None and last[:2] == (model_name, input_text):
+        return last[2]
+    try:
+        return _cached_response(model_name, task.template_hash, text_key(input_text))
+    except KeyError:
+        result = _semantic_lookup((model_name, task.template_hash), input_text) if semantic else None
+        if result is None:
+            raise
+        return result
+
+def store_result(task, model_name, input_text, result, semantic=True):
+    """Add a fresh model result to the exact-match and, if semantic, the semantic cache"""
+    if not isinstance(result, str) or not result.strip():
+        return
+    _cached_response(model_name, task.template_hash, text_key(input_text), _result=result)
+    if semantic:
+        _semantic_add((model_name, task.template_hash), input_text, result)
+
+def remember_result(task, model_name, input_text, result):
+    """Keep the last result of this task for the session"""
+    st.session_state[f"last_result_{task.template_hash}"] = (model_name, input_text, result)
+
+def run_extraction(task, llm, model_name, input_text, output, split=False):
+    """Analyze one text into the output placeholder and return (result, rows).
+
+    Earlier results are reused from the session and caches; otherwise the
+    table is streamed into output as it is generated (or, with split, each
+    paragraph is analyzed concurrently) and then swapped for a dataframe when
+    it parses. Returns None while the circuit breaker is open or when the
+    model returned no output.
+    """
+    try:
+        # Reuse this session's last result, then the shared caches
+        # (split inputs are several documents, so they only match exactly)
+        result = lookup_result(task, model_name, input_text, semantic=not split)
+    except KeyError:
+        if breaker_open():
+            st.error("The Groq API failed several times in a row. Please wait a few seconds and try again.")
+            return None
+        paragraphs = split_paragraphs(input_text) if split else [input_text]
+        if len(paragraphs) > 1:
+            result = "\n\n".join(run_concurrent(task, llm, paragraphs))
+        else:
+            # Render tokens as they arrive instead of waiting for the full table
+            with output.container():
+                result = st.write_stream(stream_extraction(task, llm, input_text))
+            # write_stream returns a list, not a string, when nothing was streamed
+            if not isinstance(result, str):
+                result = "".join(map(str, result))
+            if result.endswith(CUT_OFF_NOTE):
+                result = _close_cut_off(result[:-len(CUT_OFF_NOTE)])
+        record_success()
+        if not result.strip():
+            # Leave empty output uncached so analyzing the text again retries the model
+            output.empty()
+            st.warning("The model returned no output. Please try again.")
+            return None
+        store_result(task, model_name, input_text, result, semantic=not split)
+    remember_result(task, model_name, input_text, result)
+
+    if CUT_OFF_NOTE in result:
+        st.warning("The output limit was reached, so some entities may be missing. Try analyzing shorter texts.")
+
+    # Swap the streamed markdown for a structured table when it parses
+    rows = parse_markdown_table(result, task.columns)
+    if rows:
+        import pandas as pd
+        output.dataframe(pd.DataFrame(rows), use_container_width=True)
+    else:
+        output.markdown(result)
+    return result, rows
+
+def render_downloads(result, rows, file_stem, extension="md", icon=""):
+    """Download buttons for the raw result and, when it parsed, the rows as CSV"""
+    st.download_button(
+        label=f"{icon}Download Results",
+        data=result,
+        file_name=f"{file_stem}.{extension}",
+        mime="text/markdown" if extension == "md" else "text/plain"
+    )
+    if rows:
+        import pandas as pd
+        st.download_button(
+            label=f"{icon}Download Results (CSV)",
+            data=pd.DataFrame(rows).to_csv(index=False).encode("utf-8"),
+            file_name=f"{file_stem}.csv",
+            mime="text/csv"
+        )
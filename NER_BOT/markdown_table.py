@@ -0,0 +1,30 @@
+import re
+
+SEPARATOR_CELL = re.compile(r":?-+:?")
+
+def parse_markdown_table(text, columns):
+    """Parse the rows of a markdown table in text into dicts keyed by columns.
+
+    Header rows (followed by a |---| separator, or repeating the column
+    names case-insensitively when the model omits it) are skipped. Rows with fewer
+    cells than columns are padded with '-' and extra cells are dropped, since
+    model output does not always match the requested layout exactly.
+    """
+    lines = [
+        [cell.strip() for cell in line.strip().strip("|").split("|")]
+        for line in text.splitlines()
+        if line.strip().startswith("|")
+    ]
+    header = [column.lower() for column in columns]
+    rows = []
+    for i, cells in enumerate(lines):
+        if all(SEPARATOR_CELL.fullmatch(cell) for cell in cells):
+            continue
+        next_cells = lines[i + 1] if i + 1 < len(lines) else []
+        if next_cells and all(SEPARATOR_CELL.fullmatch(cell) for cell in next_cells):
+            continue
+        if [cell.lower() for cell in cells[:len(columns)]] == header:
+            continue
+        cells = (cells + ["-"] * len(columns))[:len(columns)]
+        rows.append(dict(zip(columns, cells)))
+    return rows
@@ -0,0 +1,136 @@
+import streamlit as st
+import os
+from markdown_table import parse_markdown_table
+from extractor_core import (
+    CUT_OFF_NOTE,
+    MAX_INPUT_CHARS,
+    MAX_INPUT_TOKENS,
+    MAX_UPLOAD_TEXTS,
+    MEDICAL_TASK,
+    MODELS,
+    approx_tokens,
+    breaker_open,
+    load_env,
+    make_llm,
+    read_uploaded_texts,
+    record_failure,
+    record_success,
+    render_downloads,
+    run_batch,
+    run_extraction,
+)
+
+# Load environment variables once per process
+load_env()
+
+# Load the Groq API key
+groq_api_key = os.getenv("GROQ_API_KEY")
+
+# Initialize Streamlit config
+st.set_page_config(page_title="Medical Entity Extractor", layout="wide")
+
+# Check if the API key is loaded
+if not groq_api_key:
+    st.error("GROQ_API_KEY not found. Please check your environment variables.")
+    st.stop()
+
+# Streamlit UI
+st.title("Medical Entity Extractor")
+st.write("This tool extracts medical entities from text using the Groq LLM API.")
+
+# Model selection
+model_name = st.selectbox(
+    "Model:",
+    MODELS,
+    help="llama-3.1-8b-instant is fastest; mixtral-8x7b-32768 gives higher quality results."
+)
+
+# Input text from the user
+input_text = st.text_area(
+    "Enter the text to analyze:",
+    placeholder="Type your tweet or text here...",
+    height=150,
+    max_chars=MAX_INPUT_CHARS
+)
+
+if st.button("Analyze"):
+    if approx_tokens(input_text) > MAX_INPUT_TOKENS:
+        st.error(f"Text is too long. Please limit input to {MAX_INPUT_CHARS:,} characters.")
+    elif input_text.strip():
+        # Initialize ChatGroq instance with proper error handling (first use loads langchain)
+        try:
+            llm = make_llm(groq_api_key, model_name)
+        except Exception as e:
+            st.error(f"Error initializing ChatGroq: {e}")
+            st.stop()
+        
+        # Show loading spinner
+        with st.spinner("Analyzing text..."):
+            try:
+                # Display results
+                st.subheader("Extracted Medical Entities")
+                extraction = run_extraction(MEDICAL_TASK, llm, model_name, input_text, st.empty())
+                if extraction is not None:
+                    # Add download buttons for results
+                    render_downloads(*extraction, "medical_entities", extension="txt")
+                
+            except Exception as e:
+                record_failure(e)
+                st.error(f"Error processing text: {str(e)}")
+                st.info("Please try again or check your API configuration.")
+    else:
+        st.warning("Please enter some text to analyze.")
+
+# Batch analysis of uploaded tweets or documents
+st.subheader("Batch Analysis")
+uploaded_file = st.file_uploader(
+    f"Upload a .txt file (one text per line) or a .csv file with a 'text' column, up to {MAX_UPLOAD_TEXTS:,} texts:",
+    type=["txt", "csv"]
+)
+
+if uploaded_file is not None and st.button("Analyze File"):
+    try:
+        texts = read_uploaded_texts(uploaded_file)
+    except ValueError as e:
+        # Empty, malformed, non-UTF-8 or oversized uploads
+        st.error(f"Could not read the uploaded file: {str(e)}")
+        st.stop()
+    if not texts:
+        st.warning("The uploaded file does not contain any text to analyze.")
+    elif breaker_open():
+        st.error("The Groq API failed several times in a row. Please wait a few seconds and try again.")
+    else:
+        with st.spinner(f"Analyzing {len(texts)} texts..."):
+            try:
+                import pandas as pd
+                llm = make_llm(groq_api_key, model_name)
+                results = run_batch(MEDICAL_TASK, llm, texts)
+                record_success()
+                
+                # Display results as one table, one row per extracted entity; texts
+                # without parsed entities keep a row holding the raw model output
+                records = []
+                for text, result in zip(texts, results):
+                    rows = parse_markdown_table(result, MEDICAL_TASK.columns)
+                    if not rows:
+                        rows = [dict.fromkeys(MEDICAL_TASK.columns, "-")]
+                        rows[0][MEDICAL_TASK.columns[-1]] = result.strip() or "-"
+                    records.extend({"Text": text, **row} for row in rows)
+                df = pd.DataFrame(records, columns=["Text"] + MEDICAL_TASK.columns)
+                cut_off = sum(CUT_OFF_NOTE in result for result in results)
+                if cut_off:
+                    st.warning(f"The output limit was reached for {cut_off} texts, so some of their entities may be missing.")
+                st.dataframe(df, use_container_width=True)
+                
+                # Add download button for results
+                st.download_button(
+                    label="Download Results (CSV)",
+                    data=df.to_csv(index=False).encode("utf-8"),
+                    file_name="medical_entities.csv",
+                    mime="text/csv"
+                )
+                
+            except Exception as e:
+                record_failure(e)
+                st.error(f"Error processing file: {str(e)}")
+                st.info("Please try again or check your API configuration.")
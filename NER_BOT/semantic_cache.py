@@ -0,0 +1,66 @@
+import functools
+import threading
+import time
+
+import faiss
+import numpy as np
+from fastembed import TextEmbedding
+
+EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+
+class SemanticCache:
+    """Near-duplicate response cache backed by FAISS inner-product indexes"""
+
+    def __init__(self, threshold=0.97, max_entries=1000, ttl=3600):
+        self.embedder = TextEmbedding(EMBEDDING_MODEL)
+        self.threshold = threshold
+        # Bounded like the exact-match cache: entries expire after ttl seconds
+        # and each key keeps at most max_entries of them
+        self.max_entries = max_entries
+        self.ttl = ttl
+        # key -> (index, [(vector, result, stored_at), ...]) with matching ids
+        self.indexes = {}
+        self.lock = threading.Lock()
+        # A miss is looked up and then added with the same text, so keep the
+        # last few embeddings rather than running the model twice
+        self.embed = functools.lru_cache(maxsize=64)(self._embed)
+
+    def _embed(self, text):
+        """Embed the text as a unit-length float32 row vector"""
+        vector = np.array(list(self.embedder.embed([text])), dtype="float32")
+        faiss.normalize_L2(vector)
+        return vector
+
+    def lookup(self, key, text):
+        """Return the stored result most similar to text, or None below the threshold or expired"""
+        if key not in self.indexes:
+            return None
+        vector = self.embed(text)
+        with self.lock:
+            index, entries = self.indexes[key]
+            scores, ids = index.search(vector, 1)
+            if ids[0][0] < 0 or scores[0][0] < self.threshold:
+                return None
+            _, result, stored_at = entries[ids[0][0]]
+        if time.time() - stored_at >= self.ttl:
+            return None
+        return result
+
+    def add(self, key, text, result):
+        """Store result under key (model and prompt fingerprint) for text"""
+        vector = self.embed(text)
+        now = time.time()
+        with self.lock:
+            if key not in self.indexes:
+                self.indexes[key] = (faiss.IndexFlatIP(vector.shape[1]), [])
+            index, entries = self.indexes[key]
+            if len(entries) >= self.max_entries:
+                # Rebuild from the newest unexpired entries, leaving room to grow
+                entries = [entry for entry in entries if now - entry[2] < self.ttl]
+                entries = entries[-max(1, self.max_entries // 2):]
+                index = faiss.IndexFlatIP(vector.shape[1])
+                if entries:
+                    index.add(np.vstack([entry[0] for entry in entries]))
+                self.indexes[key] = (index, entries)
+            index.add(vector)
+            entries.append((vector, result, now))
@@ -0,0 +1,33 @@
+from markdown_table import parse_markdown_table
+
+COLUMNS = ["Name", "Entity_Type", "City", "Country", "Country_Code"]
+
+def test_header_with_separator_is_skipped():
+    text = (
+        "| Name | Entity_Type | City | Country | Country_Code |\n"
+        "|------|:-----------:|------|---------|--------------|\n"
+        "| Tim Cook | PERSON | Cupertino | United States | US |"
+    )
+    assert parse_markdown_table(text, COLUMNS) == [
+        {"Name": "Tim Cook", "Entity_Type": "PERSON", "City": "Cupertino",
+         "Country": "United States", "Country_Code": "US"}
+    ]
+
+def test_header_without_separator_is_skipped():
+    text = (
+        "| name | entity_type | city | country | country_code |\n"
+        "| Tim | PERSON | - | - | - |"
+    )
+    assert parse_markdown_table(text, COLUMNS) == [
+        {"Name": "Tim", "Entity_Type": "PERSON", "City": "-", "Country": "-", "Country_Code": "-"}
+    ]
+
+def test_short_rows_are_padded_and_long_rows_trimmed():
+    text = "| Aspirin | MEDICATION |\n| Fever | SYMPTOM | after surgery | extra |"
+    assert parse_markdown_table(text, ["Entity", "Label", "Context"]) == [
+        {"Entity": "Aspirin", "Label": "MEDICATION", "Context": "-"},
+        {"Entity": "Fever", "Label": "SYMPTOM", "Context": "after surgery"},
+    ]
+
+def test_text_without_a_table_yields_no_rows():
+    assert parse_markdown_table("No entities found.", COLUMNS) == []